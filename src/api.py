@@ -1,80 +1,318 @@
 import os
+import time
+import asyncio
 import logging
-from typing import List, Optional
+import functools
+import gzip
+import uuid
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, Union
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, HTTPException, Depends
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel
+import aiohttp
+import deebot_client
+import orjson
+from deebot_client.authentication import Authenticator, create_rest_config
+from fastapi import FastAPI, HTTPException, Depends, Header, Request, Response, Body
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
+from starlette.datastructures import Headers
+from pydantic import BaseModel, ConfigDict
 from dotenv import load_dotenv
 
-from .deebot_manager import DeebotManager, VacuumStatus
+from .deebot_manager import DeebotManager, ManagerConfig, VacuumStatus, create_session
 
 load_dotenv()
 
-logging.basicConfig(level=logging.INFO)
+# An unknown LOG_LEVEL falls back to INFO rather than failing at import
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+_log_level_known = LOG_LEVEL in logging.getLevelNamesMapping()
+logging.basicConfig(level=LOG_LEVEL if _log_level_known else logging.INFO)
 logger = logging.getLogger(__name__)
+if not _log_level_known:
+    logger.warning("Unknown LOG_LEVEL %r, falling back to INFO", LOG_LEVEL)
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered in a single orjson pass.
+
+    Kept local because fastapi.responses.ORJSONResponse is deprecated upstream.
+    orjson serializes dataclasses natively, so VacuumStatus objects can be
+    returned without converting them to Pydantic models first.
+    """
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content)
 
 class CommandResponse(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     success: bool
     message: str
     device_id: str
 
 class DeviceInfo(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     device_id: str
     name: str
     online: bool
     battery_level: Optional[int] = None
     cleaning_state: Optional[str] = None
     error_message: Optional[str] = None
-    last_updated: Optional[str] = None
+    last_updated: Optional[float] = None
+
+class DeviceError(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
+    device_id: str
+    error: str
 
 class HealthResponse(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     status: str
     devices_connected: int
     message: str
 
+# Invariant payloads, serialized once at import
+_ROOT_BODY = orjson.dumps({
+    "message": "Robo-Bridge API",
+    "version": "1.0.0",
+    "docs": "/docs",
+    "health": "/health",
+    "test_config": "/test-config"
+})
+_INTERNAL_ERROR_BODY = orjson.dumps({"detail": "Internal server error"})
+_NOT_INITIALIZED_BODY = HealthResponse(
+    status="unhealthy",
+    devices_connected=0,
+    message="Deebot manager not initialized"
+).model_dump_json().encode()
+
+def _json_response(body: bytes, status_code: int = 200) -> Response:
+    return Response(content=body, status_code=status_code, media_type="application/json")
+
 deebot_manager: Optional[DeebotManager] = None
+manager_config: Optional[ManagerConfig] = None
+# One connection pool shared by every manager
+http_session: Optional[aiohttp.ClientSession] = None
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    global deebot_manager
+# Managers keyed by (country, continent) so /test-config can switch regions
+# without tearing down connections that are already established
+_managers: Dict[Tuple[str, str], DeebotManager] = {}
+
+# Serialized /health bodies, reused until the TTL lapses or the manager
+# reports a status change
+RESPONSE_CACHE_TTL = 5.0
+_response_cache: Dict[str, Tuple[float, Tuple[int, int], bytes]] = {}
+
+def _cached_body(key: str, manager: DeebotManager) -> Optional[bytes]:
+    entry = _response_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, version, body = entry
+    if expires_at < time.monotonic() or version != (id(manager), manager.status_version):
+        return None
+    return body
+
+def _store_body(key: str, manager: DeebotManager, body: bytes) -> Response:
+    version = (id(manager), manager.status_version)
+    _response_cache[key] = (time.monotonic() + RESPONSE_CACHE_TTL, version, body)
+    return _json_response(body)
+
+# Commands currently in flight, keyed by (device_id, action); duplicate requests
+# await the first caller's result instead of sending the command again
+_inflight_commands: Dict[Tuple[str, str], asyncio.Future] = {}
+
+async def _coalesce(device_id: str, action: str, command: Callable[[str], Awaitable[bool]]) -> bool:
+    key = (device_id, action)
+    pending = _inflight_commands.get(key)
+    if pending is not None:
+        return await asyncio.shield(pending)
     
-    email = os.getenv("ECOVACS_EMAIL")
-    password = os.getenv("ECOVACS_PASSWORD")
-    country = os.getenv("ECOVACS_COUNTRY", "US")
-    continent = os.getenv("ECOVACS_CONTINENT", "NA")
+    future = asyncio.get_running_loop().create_future()
+    _inflight_commands[key] = future
+    try:
+        result = await command(device_id)
+        future.set_result(result)
+        return result
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        # Mark the exception as retrieved in case nobody else was waiting
+        future.exception()
+        raise
+    finally:
+        del _inflight_commands[key]
+
+def _load_config() -> ManagerConfig:
+    email = os.environ.get("ECOVACS_EMAIL")
+    password = os.environ.get("ECOVACS_PASSWORD")
     
     if not email or not password:
         logger.error("ECOVACS_EMAIL and ECOVACS_PASSWORD environment variables are required")
         raise ValueError("Missing required environment variables")
     
-    deebot_manager = DeebotManager(
+    return ManagerConfig(
         email=email,
         password=password,
-        country=country,
-        continent=continent
+        country=os.environ.get("ECOVACS_COUNTRY", "US"),
+        continent=os.environ.get("ECOVACS_CONTINENT", "NA")
     )
+
+def _manager_for(country: str, continent: str) -> DeebotManager:
+    key = (country, continent)
+    manager = _managers.get(key)
+    if manager is None:
+        manager = DeebotManager(
+            email=manager_config.email,
+            password=manager_config.password,
+            country=country,
+            continent=continent,
+            session=http_session
+        )
+        _managers[key] = manager
+    return manager
+
+# Successful command responses replayed for retries carrying the same
+# Idempotency-Key, keyed by (device_id, action, key)
+IDEMPOTENCY_TTL = 60.0
+_idempotent_responses: Dict[Tuple[str, str, str], Tuple[float, bytes]] = {}
+
+async def _run_command(
+    device_id: str,
+    action: str,
+    command: Callable[[str], Awaitable[bool]],
+    success_message: str,
+    failure_message: str,
+    idempotency_key: Optional[str]
+) -> Response:
+    cache_key = None
+    if idempotency_key is not None:
+        cache_key = (device_id, action, idempotency_key)
+        entry = _idempotent_responses.get(cache_key)
+        if entry is not None and entry[0] > time.monotonic():
+            return _json_response(entry[1])
+    
+    success = await _coalesce(device_id, action, command)
+    body = CommandResponse.model_construct(
+        success=success,
+        message=success_message if success else failure_message,
+        device_id=device_id
+    ).model_dump_json().encode()
+    
+    # Failed commands are not remembered so a retry can actually retry
+    if cache_key is not None and success:
+        now = time.monotonic()
+        for key in [key for key, (expires_at, _) in _idempotent_responses.items() if expires_at <= now]:
+            del _idempotent_responses[key]
+        _idempotent_responses[cache_key] = (now + IDEMPOTENCY_TTL, body)
+    return _json_response(body)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global deebot_manager, manager_config, http_session
+    
+    manager_config = _load_config()
+    http_session = create_session()
+    deebot_manager = _manager_for(manager_config.country, manager_config.continent)
     
     # Start API service without requiring successful device initialization
     # This allows us to test different configurations and troubleshoot
-    logger.info(f"API service starting with region: {country}/{continent}")
+    logger.info("API service starting with region: %s/%s", manager_config.country, manager_config.continent)
     logger.info("Device initialization will be attempted on first API call")
     
+    # All routes are registered by now, so render the schema before serving traffic
+    _rendered_openapi()
+    
     yield
     
-    if deebot_manager:
+    for manager in _managers.values():
         try:
-            await deebot_manager.disconnect()
+            await manager.disconnect()
         except:
             pass
+    await http_session.close()
 
 app = FastAPI(
     title="Robo-Bridge API",
     description="API for controlling Ecovacs Deebot vacuum cleaners",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+    # The schema and docs pages are served by the routes below
+    openapi_url=None,
+    docs_url=None,
+    redoc_url=None
 )
 
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows gzip, honouring q=0 refusals"""
+    gzip_q = star_q = None
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding == "gzip":
+            gzip_q = q
+        elif coding == "*":
+            star_q = q
+    if gzip_q is not None:
+        return gzip_q > 0
+    return star_q is not None and star_q > 0
+
+class NegotiatingGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that skips clients refusing gzip; Starlette only substring-matches the header"""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and not _accepts_gzip(Headers(scope=scope).get("accept-encoding", "")):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+# Device lists are repetitive JSON; small bodies are not worth compressing
+app.add_middleware(NegotiatingGZipMiddleware, minimum_size=500)
+
+OPENAPI_URL = "/openapi.json"
+
+@functools.lru_cache(maxsize=1)
+def _rendered_openapi() -> Tuple[bytes, bytes]:
+    """Serialize the OpenAPI schema once, as plain and gzip-compressed bytes"""
+    body = orjson.dumps(app.openapi())
+    return body, gzip.compress(body)
+
+@app.get(OPENAPI_URL, include_in_schema=False)
+async def openapi_json(request: Request):
+    body, compressed = _rendered_openapi()
+    if _accepts_gzip(request.headers.get("accept-encoding", "")):
+        return Response(
+            content=compressed,
+            media_type="application/json",
+            headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"}
+        )
+    return _json_response(body)
+
+@app.get("/docs", include_in_schema=False)
+async def swagger_ui():
+    return get_swagger_ui_html(openapi_url=OPENAPI_URL, title=f"{app.title} - Swagger UI")
+
+@app.get("/redoc", include_in_schema=False)
+async def redoc():
+    return get_redoc_html(openapi_url=OPENAPI_URL, title=f"{app.title} - ReDoc")
+
+@app.exception_handler(Exception)
+async def unhandled_exception_handler(request: Request, exc: Exception):
+    logger.error("Request to %s failed: %s", request.url.path, exc)
+    return _json_response(_INTERNAL_ERROR_BODY, status_code=500)
+
 def get_deebot_manager() -> DeebotManager:
     if deebot_manager is None:
         raise HTTPException(status_code=503, detail="Deebot manager not initialized")
@@ -83,25 +321,25 @@ def get_deebot_manager() -> DeebotManager:
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
     if deebot_manager is None:
-        return HealthResponse(
-            status="unhealthy",
-            devices_connected=0,
-            message="Deebot manager not initialized"
-        )
+        return _json_response(_NOT_INITIALIZED_BODY)
     
     try:
         # Try to initialize if not already done
-        if not hasattr(deebot_manager, 'api_client') or deebot_manager.api_client is None:
-            await deebot_manager.initialize()
+        if not deebot_manager.initialized:
+            await deebot_manager.ensure_initialized()
         
-        devices = await deebot_manager.get_devices()
-        return HealthResponse(
+        body = _cached_body("health", deebot_manager)
+        if body is not None:
+            return _json_response(body)
+        
+        devices = deebot_manager.get_devices()
+        return _store_body("health", deebot_manager, HealthResponse.model_construct(
             status="healthy",
             devices_connected=len(devices),
             message=f"Connected to {len(devices)} devices"
-        )
+        ).model_dump_json().encode())
     except Exception as e:
-        logger.error(f"Health check failed: {e}")
+        logger.error("Health check failed: %s", e)
         # Check for specific authentication errors
         error_msg = str(e)
         if "InvalidAuthenticationError" in str(type(e).__name__) or "authentication" in error_msg.lower():
@@ -111,118 +349,101 @@ async def health_check():
         else:
             status_msg = error_msg
         
-        return HealthResponse(
+        return _json_response(HealthResponse.model_construct(
             status="unhealthy",
             devices_connected=0,
             message=status_msg
-        )
+        ).model_dump_json().encode())
 
 @app.get("/devices", response_model=List[DeviceInfo])
 async def get_devices(manager: DeebotManager = Depends(get_deebot_manager)):
-    try:
-        devices = await manager.get_devices()
-        return [
-            DeviceInfo(
-                device_id=device.device_id,
-                name=device.name,
-                online=device.online,
-                battery_level=device.battery_level,
-                cleaning_state=device.cleaning_state,
-                error_message=device.error_message,
-                last_updated=device.last_updated
-            )
-            for device in devices
-        ]
-    except Exception as e:
-        logger.error(f"Failed to get devices: {e}")
-        raise HTTPException(status_code=500, detail="Failed to retrieve devices")
+    # VacuumStatus mirrors DeviceInfo field-for-field, so the manager's
+    # serialized snapshots are already the response body
+    return _json_response(manager.get_devices_json())
+
+@app.get("/devices.ndjson")
+async def stream_devices(manager: DeebotManager = Depends(get_deebot_manager)):
+    """Stream devices as newline-delimited JSON, one object per line"""
+    async def lines():
+        async for snapshot in manager.iter_devices():
+            yield snapshot + b"\n"
+    
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
 
 @app.get("/devices/{device_id}/status", response_model=DeviceInfo)
 async def get_device_status(device_id: str, manager: DeebotManager = Depends(get_deebot_manager)):
-    try:
-        status = await manager.get_device_status(device_id)
-        if not status:
-            raise HTTPException(status_code=404, detail=f"Device {device_id} not found")
-        
-        return DeviceInfo(
-            device_id=status.device_id,
-            name=status.name,
-            online=status.online,
-            battery_level=status.battery_level,
-            cleaning_state=status.cleaning_state,
-            error_message=status.error_message,
-            last_updated=status.last_updated
-        )
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Failed to get device status for {device_id}: {e}")
-        raise HTTPException(status_code=500, detail="Failed to retrieve device status")
+    snapshot = manager.get_device_snapshot(device_id)
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail=f"Device {device_id} not found")
+    
+    return _json_response(snapshot)
+
+@app.post("/devices/status:batch", response_model=List[Union[DeviceInfo, DeviceError]])
+async def get_device_status_batch(device_ids: List[str] = Body(...), manager: DeebotManager = Depends(get_deebot_manager)):
+    # Repeated IDs share a single lookup; results keep first-seen order
+    payload = []
+    for device_id in dict.fromkeys(device_ids):
+        status = manager.get_device_status(device_id)
+        if status is None:
+            payload.append({"device_id": device_id, "error": f"Device {device_id} not found"})
+        else:
+            payload.append(status)
+    return ORJSONResponse(content=payload)
 
 @app.post("/devices/{device_id}/start", response_model=CommandResponse)
-async def start_cleaning(device_id: str, manager: DeebotManager = Depends(get_deebot_manager)):
-    try:
-        success = await manager.start_cleaning(device_id)
-        return CommandResponse(
-            success=success,
-            message="Cleaning started successfully" if success else "Failed to start cleaning",
-            device_id=device_id
-        )
-    except Exception as e:
-        logger.error(f"Failed to start cleaning for {device_id}: {e}")
-        raise HTTPException(status_code=500, detail="Failed to start cleaning")
+async def start_cleaning(device_id: str, manager: DeebotManager = Depends(get_deebot_manager), idempotency_key: Optional[str] = Header(None)):
+    return await _run_command(
+        device_id,
+        "start",
+        manager.start_cleaning,
+        "Cleaning started successfully",
+        "Failed to start cleaning",
+        idempotency_key
+    )
 
 @app.post("/devices/{device_id}/stop", response_model=CommandResponse)
-async def stop_cleaning(device_id: str, manager: DeebotManager = Depends(get_deebot_manager)):
-    try:
-        success = await manager.stop_cleaning(device_id)
-        return CommandResponse(
-            success=success,
-            message="Cleaning stopped successfully" if success else "Failed to stop cleaning",
-            device_id=device_id
-        )
-    except Exception as e:
-        logger.error(f"Failed to stop cleaning for {device_id}: {e}")
-        raise HTTPException(status_code=500, detail="Failed to stop cleaning")
+async def stop_cleaning(device_id: str, manager: DeebotManager = Depends(get_deebot_manager), idempotency_key: Optional[str] = Header(None)):
+    return await _run_command(
+        device_id,
+        "stop",
+        manager.stop_cleaning,
+        "Cleaning stopped successfully",
+        "Failed to stop cleaning",
+        idempotency_key
+    )
 
 @app.post("/devices/{device_id}/pause", response_model=CommandResponse)
-async def pause_cleaning(device_id: str, manager: DeebotManager = Depends(get_deebot_manager)):
-    try:
-        success = await manager.pause_cleaning(device_id)
-        return CommandResponse(
-            success=success,
-            message="Cleaning paused successfully" if success else "Failed to pause cleaning",
-            device_id=device_id
-        )
-    except Exception as e:
-        logger.error(f"Failed to pause cleaning for {device_id}: {e}")
-        raise HTTPException(status_code=500, detail="Failed to pause cleaning")
+async def pause_cleaning(device_id: str, manager: DeebotManager = Depends(get_deebot_manager), idempotency_key: Optional[str] = Header(None)):
+    return await _run_command(
+        device_id,
+        "pause",
+        manager.pause_cleaning,
+        "Cleaning paused successfully",
+        "Failed to pause cleaning",
+        idempotency_key
+    )
 
 @app.post("/devices/{device_id}/dock", response_model=CommandResponse)
-async def return_to_dock(device_id: str, manager: DeebotManager = Depends(get_deebot_manager)):
-    try:
-        success = await manager.return_to_dock(device_id)
-        return CommandResponse(
-            success=success,
-            message="Return to dock command sent successfully" if success else "Failed to send return to dock command",
-            device_id=device_id
-        )
-    except Exception as e:
-        logger.error(f"Failed to return device {device_id} to dock: {e}")
-        raise HTTPException(status_code=500, detail="Failed to return to dock")
+async def return_to_dock(device_id: str, manager: DeebotManager = Depends(get_deebot_manager), idempotency_key: Optional[str] = Header(None)):
+    return await _run_command(
+        device_id,
+        "dock",
+        manager.return_to_dock,
+        "Return to dock command sent successfully",
+        "Failed to send return to dock command",
+        idempotency_key
+    )
 
 @app.post("/devices/{device_id}/locate", response_model=CommandResponse)
-async def locate_device(device_id: str, manager: DeebotManager = Depends(get_deebot_manager)):
-    try:
-        success = await manager.locate_device(device_id)
-        return CommandResponse(
-            success=success,
-            message="Locate command sent successfully" if success else "Failed to send locate command",
-            device_id=device_id
-        )
-    except Exception as e:
-        logger.error(f"Failed to locate device {device_id}: {e}")
-        raise HTTPException(status_code=500, detail="Failed to locate device")
+async def locate_device(device_id: str, manager: DeebotManager = Depends(get_deebot_manager), idempotency_key: Optional[str] = Header(None)):
+    return await _run_command(
+        device_id,
+        "locate",
+        manager.locate_device,
+        "Locate command sent successfully",
+        "Failed to send locate command",
+        idempotency_key
+    )
 
 @app.post("/test-config")
 async def test_configuration(country: str, continent: str):
@@ -232,33 +453,34 @@ async def test_configuration(country: str, continent: str):
     if not deebot_manager:
         raise HTTPException(status_code=503, detail="Deebot manager not available")
     
-    # Update region settings
-    deebot_manager.country = country
-    deebot_manager.continent = continent
+    manager = _manager_for(country, continent)
     
     try:
-        # Reset API client to force re-initialization with new settings
-        deebot_manager.api_client = None
-        deebot_manager.authenticator = None
+        # Reuses the existing client when this region was already connected
+        await manager.ensure_initialized()
+        devices = manager.get_devices()
+        deebot_manager = manager
         
-        await deebot_manager.initialize()
-        devices = await deebot_manager.get_devices()
-        
-        return {
+        return ORJSONResponse(content={
             "success": True,
             "country": country,
             "continent": continent,
             "devices_found": len(devices),
             "message": f"Successfully connected with {country}/{continent}"
-        }
+        })
     except Exception as e:
-        return {
+        # Drop the failed manager so the next attempt starts from scratch, tearing
+        # down any devices a partial discovery already created
+        if manager is not deebot_manager:
+            _managers.pop((country, continent), None)
+            await manager.disconnect()
+        return ORJSONResponse(content={
             "success": False,
             "country": country,
             "continent": continent,
             "error": str(e),
             "message": f"Failed to connect with {country}/{continent}"
-        }
+        })
 
 @app.get("/debug-auth")
 async def debug_authentication():
@@ -266,24 +488,22 @@ async def debug_authentication():
     global deebot_manager
     
     if not deebot_manager:
-        return {"error": "Deebot manager not available"}
+        return ORJSONResponse(content={"error": "Deebot manager not available"})
     
     try:
-        # Import deebot_client version info
-        import deebot_client
         version = getattr(deebot_client, '__version__', 'unknown')
         
-        return {
+        return ORJSONResponse(content={
             "deebot_client_version": version,
             "country": deebot_manager.country,
             "continent": deebot_manager.continent,
-            "email_domain": deebot_manager.email.split('@')[1],
+            "email_domain": deebot_manager.email_domain,
             "has_authenticator": deebot_manager.authenticator is not None,
             "has_api_client": deebot_manager.api_client is not None,
             "devices_count": len(deebot_manager.devices)
-        }
+        })
     except Exception as e:
-        return {"error": str(e)}
+        return ORJSONResponse(content={"error": str(e)})
 
 @app.post("/test-auth")
 async def test_authentication():
@@ -291,59 +511,50 @@ async def test_authentication():
     global deebot_manager
     
     if not deebot_manager:
-        return {"error": "Deebot manager not available"}
+        return ORJSONResponse(content={"error": "Deebot manager not available"})
     
     try:
         # Reset any existing connections
         deebot_manager.api_client = None
         deebot_manager.authenticator = None
+        deebot_manager.initialized = False
         
-        # Re-initialize but catch authentication separately  
-        import aiohttp
-        from deebot_client.authentication import Authenticator, create_rest_config
-        from deebot_client.util import md5
-        import uuid
-        
-        password_hash = md5(deebot_manager.password)
-        session = aiohttp.ClientSession()
+        # Re-initialize but catch authentication separately, reusing the pooled session
         dummy_device_id = str(uuid.uuid4())[:8]
-        config = create_rest_config(session, device_id=dummy_device_id, alpha_2_country=deebot_manager.country)
-        authenticator = Authenticator(config, deebot_manager.email, password_hash)
+        config = create_rest_config(http_session, device_id=dummy_device_id, alpha_2_country=deebot_manager.country)
+        authenticator = Authenticator(config, deebot_manager.email, deebot_manager.password_hash)
         
         # Test authentication only
         credentials = await authenticator._auth_client.login()
-        await session.close()
         
-        return {
+        return ORJSONResponse(content={
             "success": True,
             "message": "Authentication successful!",
             "country": deebot_manager.country,
             "continent": deebot_manager.continent,
             "user_id": credentials.user_id if hasattr(credentials, 'user_id') else "unknown",
             "expires_at": credentials.expires_at if hasattr(credentials, 'expires_at') else "unknown"
-        }
+        })
     except Exception as e:
-        try:
-            await session.close()
-        except:
-            pass
-        return {
+        return ORJSONResponse(content={
             "success": False,
             "error": str(e),
             "error_type": str(type(e).__name__),
             "message": "Authentication failed - check credentials and region"
-        }
+        })
 
 @app.get("/")
 async def root():
-    return {
-        "message": "Robo-Bridge API",
-        "version": "1.0.0",
-        "docs": "/docs",
-        "health": "/health",
-        "test_config": "/test-config"
-    }
+    return _json_response(_ROOT_BODY)
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        log_level="warning",
+        access_log=False
+    )
\ No newline at end of file
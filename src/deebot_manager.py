@@ -1,20 +1,64 @@
 import asyncio
+import hashlib
 import logging
-from typing import Dict, List, Optional
+import random
+import sys
+import time
+import uuid
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 from dataclasses import dataclass
 import aiohttp
+import orjson
 from deebot_client.api_client import ApiClient
 from deebot_client.authentication import Authenticator, create_rest_config
 from deebot_client.device import Device
+from deebot_client.exceptions import ApiError, ApiTimeoutError
 from deebot_client.events import BatteryEvent, StateEvent, ErrorEvent, AvailabilityEvent
 from deebot_client.commands.json.clean import Clean, CleanAction
 from deebot_client.commands.json.charge import Charge
 from deebot_client.commands.json.play_sound import PlaySound
-from deebot_client.util import md5
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Seconds a serialized status snapshot may be served before it is rebuilt
+SNAPSHOT_TTL = 2.0
+
+# Overall seconds discovery may take, including the first login and any retries;
+# leaves room for the SDK's own 10 s back-off when the portal answers 502
+DISCOVERY_TIMEOUT = 30.0
+
+# Transient network failures worth retrying; auth and API errors are not
+RETRYABLE_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError, ApiTimeoutError)
+
+def _is_retryable(e: BaseException) -> bool:
+    """Whether e is transient, including ApiErrors that only wrap transient failures"""
+    if isinstance(e, RETRYABLE_ERRORS):
+        return True
+    # ApiClient.get_devices runs its requests in a TaskGroup and re-raises
+    # any failure as ApiError from the ExceptionGroup
+    cause = e.__cause__
+    if isinstance(e, ApiError) and isinstance(cause, BaseExceptionGroup):
+        transient, rest = cause.split(RETRYABLE_ERRORS)
+        return transient is not None and rest is None
+    return False
+
+async def _retry(coro_factory, attempts: int = 4, base: float = 0.2):
+    """Await coro_factory() with exponential backoff and jitter on transient errors"""
+    for attempt in range(attempts):
+        try:
+            return await coro_factory()
+        except Exception as e:
+            if not _is_retryable(e) or attempt == attempts - 1:
+                raise
+            delay = base * 2 ** attempt + random.uniform(0, base)
+            logger.warning("Transient error (attempt %d/%d), retrying in %.2fs: %s", attempt + 1, attempts, delay, e)
+            await asyncio.sleep(delay)
+
+def create_session() -> aiohttp.ClientSession:
+    """Create the pooled HTTP session used for Ecovacs REST calls"""
+    return aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=20, ttl_dns_cache=300))
+
+@dataclass(slots=True)
 class VacuumStatus:
     device_id: str
     name: str
@@ -22,57 +66,124 @@ class VacuumStatus:
     battery_level: Optional[int] = None
     cleaning_state: Optional[str] = None
     error_message: Optional[str] = None
-    last_updated: Optional[str] = None
+    last_updated: Optional[float] = None
+
+@dataclass(frozen=True, slots=True)
+class ManagerConfig:
+    email: str
+    password: str
+    country: str = "US"
+    continent: str = "NA"
 
 class DeebotManager:
-    def __init__(self, email: str, password: str, country: str = "US", continent: str = "NA"):
+    # Stateless commands are shared; Clean is built per call because it rewrites
+    # its own args between START and RESUME based on the device state
+    _CMD_DOCK = Charge()
+    _CMD_LOCATE = PlaySound()
+    
+    def __init__(self, email: str, password: str, country: str = "US", continent: str = "NA",
+                 min_event_interval: float = 5.0, session: Optional[aiohttp.ClientSession] = None):
         self.email = email
-        self.password = password
+        self.email_domain = email.partition('@')[2]
+        self._email_redacted = f"{email[:3]}***@{self.email_domain}" if '@' in email else "***"
+        # Only the hash is kept; the plain password is not stored on the manager
+        self.password_hash = hashlib.md5(password.encode()).hexdigest()
         self.country = country
         self.continent = continent
+        # Repeated battery readings inside this window are dropped
+        self.min_event_interval = min_event_interval
         self.authenticator = None
         self.api_client = None
+        # A session passed in is shared with other managers and closed by its owner
+        self._session = session
+        self._owns_session = session is None
         self.devices: Dict[str, Device] = {}
         self.device_status: Dict[str, VacuumStatus] = {}
+        # Bumped whenever any device status changes so callers can cache derived views
+        self.status_version = 0
+        self._snapshot_cache: Dict[str, Tuple[float, bytes]] = {}
+        self._last_event_ts: Dict[str, float] = {}
+        # Set only once discovery succeeds; api_client alone is assigned mid-initialize
+        self.initialized = False
+        self._init_future: Optional[asyncio.Future] = None
+    
+    async def ensure_initialized(self):
+        """Initialize once, letting concurrent callers share the in-flight attempt and its outcome"""
+        if self.initialized:
+            return
+        if self._init_future is not None:
+            # Waiters see a failed attempt's error too, never a half-built manager
+            return await asyncio.shield(self._init_future)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._init_future = future
+        try:
+            await self.initialize()
+            self.initialized = True
+            future.set_result(None)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved in case nobody else was waiting
+            future.exception()
+            raise
+        finally:
+            # Cleared either way so the next caller after a failure starts a fresh attempt
+            self._init_future = None
+    
+    def _mark_changed(self, device_id: Optional[str] = None):
+        self.status_version += 1
+        if device_id is None:
+            self._snapshot_cache.clear()
+        else:
+            self._snapshot_cache.pop(device_id, None)
         
     async def initialize(self):
         try:
-            logger.info(f"Initializing Deebot manager for country: {self.country}, continent: {self.continent}")
-            
-            password_hash = md5(self.password)
-            logger.info(f"Password hash: {password_hash[:8]}...")
+            logger.info("Initializing Deebot manager for country: %s, continent: %s", self.country, self.continent)
             
-            session = aiohttp.ClientSession()
+            if self._session is None:
+                self._session = create_session()
             # Use a dummy device_id for authentication - this will be replaced during actual device discovery
-            import uuid
             dummy_device_id = str(uuid.uuid4())[:8]
-            config = create_rest_config(session, device_id=dummy_device_id, alpha_2_country=self.country)
-            logger.info(f"Created REST config: {config}")
+            config = create_rest_config(self._session, device_id=dummy_device_id, alpha_2_country=self.country)
+            logger.info("Created REST config: %s", config)
             
-            logger.info(f"Creating authenticator for email: {self.email[:3]}***@{self.email.split('@')[1]}")
-            self.authenticator = Authenticator(config, self.email, password_hash)
+            logger.info("Creating authenticator for email: %s", self._email_redacted)
+            self.authenticator = Authenticator(config, self.email, self.password_hash)
             
             logger.info("Creating API client...")
             self.api_client = ApiClient(self.authenticator)
             
             logger.info("Starting device discovery...")
             await self._discover_devices()
-            logger.info(f"Initialization complete - found {len(self.devices)} devices")
+            logger.info("Initialization complete - found %d devices", len(self.devices))
             
         except Exception as e:
-            logger.error(f"Failed to initialize Deebot manager: {e}")
-            logger.error(f"Check your .env file credentials and ensure robots are online in Ecovacs app")
-            import traceback
-            logger.error(f"Full initialization traceback: {traceback.format_exc()}")
+            # Leave the manager uninitialized so the next caller retries instead of
+            # mistaking the half-built client for a successful connection
+            self.api_client = None
+            self.authenticator = None
+            logger.exception("Failed to initialize Deebot manager: %s", e)
+            logger.error("Check your .env file credentials and ensure robots are online in Ecovacs app")
             raise
     
     async def _discover_devices(self):
         try:
             logger.info("Attempting to authenticate and discover devices...")
             logger.info("Calling api_client.get_devices()...")
-            devices = await self.api_client.get_devices()
-            logger.info(f"API returned devices object: {devices}")
-            logger.info(f"Devices object type: {type(devices)}")
+            try:
+                devices = await asyncio.wait_for(_retry(self.api_client.get_devices), DISCOVERY_TIMEOUT)
+            except asyncio.TimeoutError:
+                # A bare TimeoutError has an empty message, which says nothing in /health
+                raise asyncio.TimeoutError(f"Device discovery timed out after {DISCOVERY_TIMEOUT:g}s") from None
+            logger.debug(
+                "API returned devices: mqtt=%d others=%d",
+                len(getattr(devices, 'mqtt', None) or []),
+                len(getattr(devices, 'devices', None) or [])
+            )
             
             # Extract actual DeviceInfo objects from the Devices container
             if hasattr(devices, 'mqtt') and devices.mqtt:
@@ -84,8 +195,8 @@ class DeebotManager:
             else:
                 device_list = [devices] if devices else []
             
-            logger.info(f"Device list: {device_list}")
-            logger.info(f"Number of devices found: {len(device_list)}")
+            logger.debug("Device list: %s", device_list)
+            logger.info("Number of devices found: %d", len(device_list))
             
             if len(device_list) == 0:
                 logger.warning("No devices found! This could indicate:")
@@ -95,220 +206,221 @@ class DeebotManager:
                 logger.warning("- Library compatibility issues")
             
             for i, device in enumerate(device_list):
-                logger.info(f"Processing device {i+1}: {device}")
-                logger.info(f"Device type: {type(device)}")
-                logger.info(f"Device attributes: {dir(device)}")
+                logger.debug("Processing device %d: %s (%s)", i + 1, device, type(device).__name__)
                 
                 # Extract device info from DeviceInfo object structure
+                # Fallback strings are only built when the field is actually missing
                 if hasattr(device, 'api') and isinstance(device.api, dict):
-                    device_id = device.api.get('did', f'unknown_{i}')
-                    device_name = device.api.get('nick', device.api.get('deviceName', f'Deebot {device_id}'))
+                    device_id = device.api.get('did')
+                    device_name = device.api.get('nick')
+                    if device_name is None:
+                        device_name = device.api.get('deviceName')
                 else:
-                    device_id = getattr(device, 'device_id', f'unknown_{i}')
-                    device_name = getattr(device, 'name', f'Deebot {device_id}')
+                    device_id = getattr(device, 'device_id', None)
+                    device_name = getattr(device, 'name', None)
+                if device_id is None:
+                    device_id = f'unknown_{i}'
+                if device_name is None:
+                    device_name = f'Deebot {device_id}'
                 
-                logger.info(f"Device ID: {device_id}, Name: {device_name}")
+                # Every request and event looks devices up by this key
+                device_id = sys.intern(str(device_id))
+                
+                # Handlers capture the status object so events skip the dict lookup
+                status = VacuumStatus(
+                    device_id=device_id,
+                    name=device_name,
+                    online=False
+                )
+                self.device_status[device_id] = status
                 
                 # Create actual Device object from DeviceInfo for command execution
                 try:
                     actual_device = Device(device, self.authenticator)
                     self.devices[device_id] = actual_device
-                    logger.info(f"Created Device object for {device_id} ({device_name})")
                     
                     # Subscribe to events with device-specific handlers
-                    battery_handler = self._create_battery_event_handler(device_id)
-                    state_handler = self._create_state_event_handler(device_id)
-                    error_handler = self._create_error_event_handler(device_id)
-                    availability_handler = self._create_availability_event_handler(device_id)
+                    battery_handler = self._create_battery_event_handler(device_id, status)
+                    state_handler = self._create_state_event_handler(device_id, status)
+                    error_handler = self._create_error_event_handler(device_id, status)
+                    availability_handler = self._create_availability_event_handler(device_id, status)
                     
                     actual_device.events.subscribe(BatteryEvent, battery_handler)
                     actual_device.events.subscribe(StateEvent, state_handler)
                     actual_device.events.subscribe(ErrorEvent, error_handler)
                     actual_device.events.subscribe(AvailabilityEvent, availability_handler)
                     
-                    logger.info(f"Subscribed to battery, state, error, and availability events for {device_id}")
+                    logger.debug("Device %s (%s): created and subscribed to battery, state, error, and availability events",
+                                 device_id, device_name)
                     
                 except Exception as e:
-                    logger.error(f"Failed to create Device object for {device_id}: {e}")
+                    logger.error("Failed to create Device object for %s: %s", device_id, e)
                     # Still store the DeviceInfo for basic information
                     self.devices[device_id] = device
                 
-                self.device_status[device_id] = VacuumStatus(
-                    device_id=device_id,
-                    name=device_name,
-                    online=False
-                )
-                
-                logger.info(f"Device {device_id} ({device_name}) added to device list")
-                
-            logger.info(f"Successfully processed {len(self.devices)} devices")
+            self._mark_changed()
+            # One record for the whole batch rather than one per device
+            if logger.isEnabledFor(logging.INFO):
+                lines = "\n".join(f"  {status.device_id}: {status.name}" for status in self.device_status.values())
+                logger.info("Successfully processed %d devices:\n%s", len(self.devices), lines)
             
         except Exception as e:
-            logger.error(f"Failed to discover devices: {e}")
-            logger.error(f"Exception type: {type(e)}")
-            logger.error(f"Exception details: {repr(e)}")
-            import traceback
-            logger.error(f"Full traceback: {traceback.format_exc()}")
+            logger.error("Failed to discover devices: %s (type=%s)", e, type(e).__name__)
             raise
     
-    def _create_battery_event_handler(self, device_id: str):
+    def _create_battery_event_handler(self, device_id: str, status: VacuumStatus):
         """Create a battery event handler for a specific device"""
         async def handler(event: BatteryEvent):
-            if device_id in self.device_status:
-                status = self.device_status[device_id]
-                status.battery_level = event.value
-                status.online = True
-                import time
-                status.last_updated = str(time.time())
-                logger.info(f"Battery event for {device_id}: {event.value}% - device now online")
-            else:
-                logger.warning(f"Received battery event for unknown device {device_id}")
+            now = time.monotonic()
+            if (status.online and event.value == status.battery_level
+                    and now - self._last_event_ts.get(device_id, 0.0) < self.min_event_interval):
+                return
+            self._last_event_ts[device_id] = now
+            
+            status.battery_level = event.value
+            status.online = True
+            status.last_updated = time.time()
+            self._mark_changed(device_id)
+            logger.info("Battery event for %s: %s%% - device now online", device_id, event.value)
         return handler
     
-    def _create_state_event_handler(self, device_id: str):
+    def _create_state_event_handler(self, device_id: str, status: VacuumStatus):
         """Create a state event handler for a specific device"""
         async def handler(event: StateEvent):
-            if device_id in self.device_status:
-                status = self.device_status[device_id]
-                # Convert state enum to human-readable string
-                state_name = event.state.name.lower().replace('_', ' ').title()
-                status.cleaning_state = state_name
-                
-                # Clear error message if not in error state
-                if event.state.name != 'ERROR':
-                    if status.error_message and "Error code" in status.error_message:
-                        status.error_message = None
-                
-                import time
-                status.last_updated = str(time.time())
-                logger.info(f"State event for {device_id}: {state_name}")
-            else:
-                logger.warning(f"Received state event for unknown device {device_id}")
+            # Convert state enum to human-readable string
+            state_name = event.state.name.lower().replace('_', ' ').title()
+            status.cleaning_state = state_name
+            
+            # Clear error message if not in error state
+            if event.state.name != 'ERROR':
+                if status.error_message and "Error code" in status.error_message:
+                    status.error_message = None
+            
+            status.last_updated = time.time()
+            self._mark_changed(device_id)
+            logger.info("State event for %s: %s", device_id, state_name)
         return handler
     
-    def _create_error_event_handler(self, device_id: str):
+    def _create_error_event_handler(self, device_id: str, status: VacuumStatus):
         """Create an error event handler for a specific device"""
         async def handler(event: ErrorEvent):
-            if device_id in self.device_status:
-                status = self.device_status[device_id]
-                if event.description:
-                    status.error_message = event.description
-                else:
-                    status.error_message = f"Error code {event.code}"
-                
-                import time
-                status.last_updated = str(time.time())
-                logger.warning(f"Error event for {device_id}: {status.error_message}")
+            if event.description:
+                status.error_message = event.description
             else:
-                logger.warning(f"Received error event for unknown device {device_id}")
+                status.error_message = f"Error code {event.code}"
+            
+            status.last_updated = time.time()
+            self._mark_changed(device_id)
+            logger.warning("Error event for %s: %s", device_id, status.error_message)
         return handler
     
-    def _create_availability_event_handler(self, device_id: str):
+    def _create_availability_event_handler(self, device_id: str, status: VacuumStatus):
         """Create an availability event handler for a specific device"""
         async def handler(event: AvailabilityEvent):
-            if device_id in self.device_status:
-                status = self.device_status[device_id]
-                status.online = event.available
-                
-                if not event.available:
-                    status.error_message = "Device unavailable"
-                    status.cleaning_state = None
-                else:
-                    # Clear unavailability error when device comes back online
-                    if status.error_message == "Device unavailable":
-                        status.error_message = None
-                
-                import time
-                status.last_updated = str(time.time())
-                logger.info(f"Availability event for {device_id}: {'online' if event.available else 'offline'}")
+            status.online = event.available
+            
+            if not event.available:
+                status.error_message = "Device unavailable"
+                status.cleaning_state = None
             else:
-                logger.warning(f"Received availability event for unknown device {device_id}")
+                # Clear unavailability error when device comes back online
+                if status.error_message == "Device unavailable":
+                    status.error_message = None
+            
+            status.last_updated = time.time()
+            self._mark_changed(device_id)
+            logger.info("Availability event for %s: %s", device_id, 'online' if event.available else 'offline')
         return handler
     
-    async def get_devices(self) -> List[VacuumStatus]:
+    def get_devices(self) -> List[VacuumStatus]:
         return list(self.device_status.values())
     
-    async def get_device_status(self, device_id: str) -> Optional[VacuumStatus]:
-        if device_id not in self.devices:
-            return None
+    async def iter_devices(self) -> AsyncIterator[bytes]:
+        """Yield each device's cached JSON snapshot, as served by the other list endpoints"""
+        # Iterate over a copy so discovery can't resize the dict mid-stream
+        for device_id in list(self.device_status):
+            snapshot = self._serialize_status(device_id, time.monotonic())
+            if snapshot is not None:
+                yield snapshot
+    
+    def _serialize_status(self, device_id: str, now: float) -> Optional[bytes]:
+        entry = self._snapshot_cache.get(device_id)
+        if entry is not None and now - entry[0] < SNAPSHOT_TTL:
+            return entry[1]
         
-        # Return current cached status
+        status = self.device_status.get(device_id)
+        if status is None:
+            return None
+        snapshot = orjson.dumps(status)
+        self._snapshot_cache[device_id] = (now, snapshot)
+        return snapshot
+    
+    def get_device_snapshot(self, device_id: str) -> Optional[bytes]:
+        """Return the device status serialized as JSON, rebuilt at most once per TTL or change"""
+        return self._serialize_status(device_id, time.monotonic())
+    
+    def get_devices_json(self) -> bytes:
+        """Return all device statuses as a JSON array assembled from cached snapshots"""
+        now = time.monotonic()
+        return b"[" + b",".join(self._serialize_status(device_id, now) for device_id in self.device_status) + b"]"
+    
+    def get_device_status(self, device_id: str) -> Optional[VacuumStatus]:
+        # Discovery fills devices and device_status with the same keys,
+        # so one lookup answers both "known?" and "status?"
         return self.device_status.get(device_id)
     
-    async def start_cleaning(self, device_id: str) -> bool:
-        if device_id not in self.devices:
-            logger.error(f"Device {device_id} not found")
+    async def _execute(self, device_id: str, command, description: str) -> bool:
+        device = self.devices.get(device_id)
+        if device is None:
+            logger.error("Device %s not found", device_id)
             return False
-            
+        
         try:
-            device = self.devices[device_id]
-            await device.execute_command(Clean(action=CleanAction.START))
-            logger.info(f"Started cleaning on device {device_id}")
-            return True
+            await device.execute_command(command)
         except Exception as e:
-            logger.error(f"Failed to start cleaning on device {device_id}: {e}")
+            logger.error("Failed to %s on device %s: %s", description, device_id, e)
             return False
+        
+        self._mark_changed(device_id)
+        logger.info("Sent %s command to device %s", description, device_id)
+        return True
+    
+    async def start_cleaning(self, device_id: str) -> bool:
+        return await self._execute(device_id, Clean(action=CleanAction.START), "start cleaning")
     
     async def stop_cleaning(self, device_id: str) -> bool:
-        if device_id not in self.devices:
-            logger.error(f"Device {device_id} not found")
-            return False
-            
-        try:
-            device = self.devices[device_id]
-            await device.execute_command(Clean(action=CleanAction.STOP))
-            logger.info(f"Stopped cleaning on device {device_id}")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to stop cleaning on device {device_id}: {e}")
-            return False
+        return await self._execute(device_id, Clean(action=CleanAction.STOP), "stop cleaning")
     
     async def return_to_dock(self, device_id: str) -> bool:
-        if device_id not in self.devices:
-            logger.error(f"Device {device_id} not found")
-            return False
-            
-        try:
-            device = self.devices[device_id]
-            await device.execute_command(Charge())
-            logger.info(f"Sent return to dock command to device {device_id}")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to return device {device_id} to dock: {e}")
-            return False
+        return await self._execute(device_id, self._CMD_DOCK, "return to dock")
     
     async def pause_cleaning(self, device_id: str) -> bool:
-        if device_id not in self.devices:
-            logger.error(f"Device {device_id} not found")
-            return False
-            
-        try:
-            device = self.devices[device_id]
-            await device.execute_command(Clean(action=CleanAction.PAUSE))
-            logger.info(f"Paused cleaning on device {device_id}")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to pause cleaning on device {device_id}: {e}")
-            return False
+        return await self._execute(device_id, Clean(action=CleanAction.PAUSE), "pause cleaning")
     
     async def locate_device(self, device_id: str) -> bool:
-        if device_id not in self.devices:
-            logger.error(f"Device {device_id} not found")
-            return False
-            
-        try:
-            device = self.devices[device_id]
-            await device.execute_command(PlaySound())
-            logger.info(f"Sent locate command to device {device_id}")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to locate device {device_id}: {e}")
-            return False
+        return await self._execute(device_id, self._CMD_LOCATE, "locate")
     
     async def disconnect(self):
-        try:
-            for device in self.devices.values():
-                await device.disconnect()
-            logger.info("Disconnected from all devices")
-        except Exception as e:
-            logger.error(f"Error during disconnect: {e}")
\ No newline at end of file
+        # Devices that failed to initialize are stored as plain DeviceInfo with nothing to tear down
+        device_ids = [device_id for device_id, device in self.devices.items() if isinstance(device, Device)]
+        results = await asyncio.gather(
+            *(self.devices[device_id].teardown() for device_id in device_ids),
+            return_exceptions=True
+        )
+        
+        failures = 0
+        for device_id, result in zip(device_ids, results):
+            if isinstance(result, Exception):
+                failures += 1
+                logger.error("Error disconnecting device %s: %s", device_id, result)
+        if device_ids and not failures:
+            logger.info("Disconnected from all %d devices", len(device_ids))
+        # Torn-down devices cannot be reused; a later ensure_initialized() rediscovers
+        self.devices.clear()
+        self.device_status.clear()
+        self.initialized = False
+        self._mark_changed()
+        
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
\ No newline at end of file